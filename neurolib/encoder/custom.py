@@ -54,6 +54,17 @@ class CustomNode(InnerNode):
     in_builder.output_nodes[innernode_name] = node 
     in_builder._oslot_to_inner_node_oslot[oslot] = (innernode_name, inode_oslot_name)
 
+  def __call__(self, *inputs):
+    """
+    Build the CustomNode's outputs from positional inputs. The i-th input is
+    fed to islot i.
+    """
+    if len(inputs) != self.num_expected_inputs:
+      raise ValueError("{} expects {} inputs, got {}"
+                       "".format(self.name, self.num_expected_inputs,
+                                 len(inputs)))
+    return self.build_outputs(**dict(zip(self._main_input_names, inputs)))
+
   def _build(self):
     """
     """
@@ -90,6 +101,8 @@ class CustomInnerNode(CustomNode):
     # inputs, TODO: MAKE THIS RIGHT
     self.inputs = inputs
     self.num_expected_inputs = len(self.inputs)
+    self._main_input_names = tuple('imain' + str(i) for i in
+                                   range(self.num_expected_inputs))
     
     # directives object
     self.directives = NodeDirectives(self.directives)
@@ -150,11 +163,6 @@ class CustomInnerNode(CustomNode):
       
     return node_name
   
-  def __call__(self, *inputs):
-    """
-    """
-    raise NotImplementedError
-        
   def _build(self):
     """
     Build the Custom Node
@@ -268,6 +276,7 @@ class CustomCellNode(CustomNode):
     
     # inputs, TODO: MAKE THIS RIGHT
     self.num_expected_inputs = num_inputs
+    self._main_input_names = tuple('imain' + str(i) for i in range(num_inputs))
     
     # directives object
     self.directives = NodeDirectives(self.directives)
@@ -313,11 +322,6 @@ class CustomCellNode(CustomNode):
       
     return node_name
         
-  def __call__(self, *inputs):
-    """
-    """
-    raise NotImplementedError("")
-        
   def _build(self):
     """
     """
@@ -17,6 +17,7 @@ import tensorflow as tf
 
 from neurolib.encoder.input import NormalInputNode
 from neurolib.encoder.normal import NormalTriLNode
+from neurolib.utils.utils import xla_enabled
 from tensorflow.python.framework.tensor_shape import TensorShape  #pylint: disable=no-name-in-module
 
 # pylint: disable=bad-indentation, no-member, protected-access
@@ -141,23 +142,31 @@ class CustomCell(tf.nn.rnn_cell.RNNCell):
     """
     return self.encoder.get_oslot_shape(oslot)
    
+  @staticmethod
+  def make_tuple(t):
+    """
+    Wrap a single tensor in a tuple. Tuples and lists are returned as tuples.
+    """
+    return tuple(t) if isinstance(t, (tuple, list)) else (t,)
+  
+  def _build_encoder_outputs(self, inputs, state):
+    """
+    Build the outputs of the cell encoder for a single RNN step.
+    
+    The encoder islots are fed the cell inputs followed by the cell states.
+    """
+    inputs = self.make_tuple(inputs)
+    state = self.make_tuple(state)
+    
+    return self.encoder(*(inputs + state))
+  
   def __call__(self, inputs, state):  #pylint: disable=signature-differs
     """
     Call the cell on some inputs.
     
     This method defers to the cell's encoder `build_outputs` method.
     """
-    def make_tuple(t):
-      try:
-        return tuple(t)
-      except TypeError:
-        return (t,)
-    
-    inputs = make_tuple(inputs)
-    state = make_tuple(state)    
-    enc_inputs = {'imain'+str(i) : val for i, val in enumerate(inputs + state)}
-    
-    output = self.encoder.build_outputs(**enc_inputs)
+    output = self._build_encoder_outputs(inputs, state)
     
     return output[0], output[0]
   
@@ -309,18 +318,16 @@ class NormalTriLCell(CustomCell):
   def __call__(self, inputs, state):
     """
     Evaluate the cell encoder on a set of inputs
+
+    If XLA is enabled (see `xla_enabled`), the ops of the normal sample are
+    marked for XLA compilation to be fused into a single kernel. The batch
+    dimension is not fixed, so XLA may recompile them for every new batch size.
     """
-    def make_tuple(t):
-      try:
-        return tuple(t)
-      except TypeError:
-        return (t,)
-    
-    inputs = make_tuple(inputs)
-    state = make_tuple(state)    
-    enc_inputs = {'imain'+str(i) : val for i, val in enumerate(inputs + state)}
-    
-    output = self.encoder.build_outputs(**enc_inputs)
+    if xla_enabled():
+      with tf.contrib.compiler.jit.experimental_jit_scope():
+        output = self._build_encoder_outputs(inputs, state)
+    else:
+      output = self._build_encoder_outputs(inputs, state)
         
 #     output, _ = super(NormalTriLCell, self).__call__(inputs, state)
     
@@ -15,7 +15,7 @@
 # ==============================================================================
 import pickle
 
-from neurolib.models.models import Model
+from neurolib.models.models import Model, in_model_graph
 from neurolib.builders.sequential_builder import SequentialBuilder
 from neurolib.trainer.gd_trainer import GDTrainer
 from neurolib.encoder.normal import NormalTriLNode
@@ -221,6 +221,7 @@ class DeepKalmanFilter(Model):
     this_model_dirs.update(directives)
     super(DeepKalmanFilter, self)._update_default_directives(**this_model_dirs)
                 
+  @in_model_graph
   def build(self):
     """
     Build the DeepKalmanFilter
@@ -14,20 +14,43 @@
 #
 # ==============================================================================
 import abc
+import functools
 import pickle
 import os
 from abc import abstractmethod
 
 import numpy as np
+from tensorflow.core.protobuf import rewriter_config_pb2
 
 from neurolib.utils.dataset_manip import (get_dataset_batch_size,
+                                          batch_iterator_from_dataset,
                                           prepare_restore_user_dataset_for_eval,
+                                          make_input_node_feed_key,
+                                          make_contiguous,
+                                          check_dataset_nsamps,
                                           merge_datasets)
 from neurolib.trainer.costs import *  #pylint: disable=wildcard-import
+from neurolib.utils.utils import get_latest_metafile_in_dir, xla_enabled
 from _collections import defaultdict
 
 # pylint: disable=bad-indentation, no-member, protected-access
 
+def in_model_graph(f):
+  """
+  Method decorator to use in every method of a Model subclass that adds ops to
+  the tensorflow graph. The method is run with the Model graph as the default
+  graph.
+  """
+  @functools.wraps(f)
+  def wrapped(self, *args, **kwargs):
+    """
+    Run a Model method inside the Model graph
+    """
+    with self.graph.as_default():
+      return f(self, *args, **kwargs)
+
+  return wrapped
+
 
 class Model(abc.ABC):
   """
@@ -74,10 +97,18 @@ class Model(abc.ABC):
     """
     Initialize a Model.
     
-    Starts a tf.Session for this Model
+    Starts a tf.Session for this Model on a tf.Graph owned by the Model, so that
+    several Models can coexist in the same process. If a custom builder is
+    provided, its tensors already live in the current default graph, which is
+    then used instead.
     """
-#     tf.reset_default_graph()
-    self.sess = tf.Session()
+    if getattr(self, 'builder', None) is None:
+      self.graph = tf.Graph()
+    else:
+      self.graph = tf.get_default_graph()
+    self.sess = tf.Session(graph=self.graph, config=self._get_session_config())
+    self._run_opts = tf.RunOptions(trace_level=tf.RunOptions.NO_TRACE,
+                                   report_tensor_allocations_upon_oom=False)
     
     # Deal with the Model directives
     self.directives = {}
@@ -85,6 +116,7 @@ class Model(abc.ABC):
     self.split_model_directives()
     
     self._is_built = False
+    self._reduce_ops = {}
     
   @property
   def main_scope(self):
@@ -93,6 +125,33 @@ class Model(abc.ABC):
     """
     return self._main_scope
       
+  @staticmethod
+  def _get_session_config():
+    """
+    Return the tf.ConfigProto for this Model's tf.Session.
+
+    XLA JIT compilation is turned on only if the environment variable
+    NEUROLIB_XLA is set to '1', since it may slow down RNNs with dynamic shapes.
+    Grappler's layout, remapping, arithmetic, constant folding and function
+    optimizers are explicitly turned on. The memory optimizer is turned off,
+    since swapping the small per-step tensors of the RNNs between host and
+    device only adds copies.
+    """
+    config = tf.ConfigProto()
+    graph_options = config.graph_options
+    if xla_enabled():
+      graph_options.optimizer_options.global_jit_level = tf.OptimizerOptions.ON_1
+    
+    rewriter = rewriter_config_pb2.RewriterConfig
+    graph_options.rewrite_options.CopyFrom(
+        rewriter(layout_optimizer=rewriter.ON,
+                 remapping=rewriter.ON,
+                 arithmetic_optimization=rewriter.ON,
+                 constant_folding=rewriter.ON,
+                 function_optimization=rewriter.ON,
+                 memory_optimization=rewriter.NO_MEM_OPT))
+    return config
+
   def _update_default_directives(self, **dirs):
     """
     Update the Model directives
@@ -138,8 +197,8 @@ class Model(abc.ABC):
     This method changes the provided dict in place
     """
     scope = self.main_scope
-    for key in dataset:
-      dataset[scope + '/' + key + '_main:0'] = dataset.pop(key)
+    for key in list(dataset):
+      dataset[make_input_node_feed_key(key, scope)] = dataset.pop(key)
     return dataset
     
   def prepare_dataset(self, dataset, batch_size=None):
@@ -157,14 +216,13 @@ class Model(abc.ABC):
     above.
     """
     scope = self.main_scope
-    dset = {}
     
     # Always feed to InputNode oslots with well defined, unique otensor names
-    for key in dataset:
-      dset[scope + '/' + key + '_main:0'] = dataset[key]
+    dset = {make_input_node_feed_key(key, scope) : make_contiguous(value)
+            for key, value in dataset.items()}
     if batch_size is None:
-      bsz = dataset[key].shape[0]  #pylint: disable=undefined-loop-variable
-    dset = self.add_dummies_to_dataset(dataset, bsz)
+      batch_size = next(iter(dataset.values())).shape[0]
+    dset = self.add_dummies_to_dataset(dset, batch_size)
     
     return dset
         
@@ -178,13 +236,22 @@ class Model(abc.ABC):
       
       shuffle (bool) : Should the data be shuffled?
     """
+    bsz = self.batch_size
     nsamps = len(list(dataset.values())[0])
+    check_dataset_nsamps(dataset, nsamps)
     l_inds = np.arange(nsamps)
     if shuffle:
       np.random.shuffle(l_inds)
-    for idx in range(nsamps//self.batch_size):
-      yield {key : value[l_inds[idx:idx+self.batch_size]] for key, value
-             in dataset.items()}
+    idx_batches = l_inds[:(nsamps//bsz)*bsz].reshape(-1, bsz)
+    
+    # The batch buffers are reused, consume each batch before the next one. The
+    # indices are in range after the check above, so mode='clip' is safe
+    batch = {key : np.empty((bsz,) + value.shape[1:], dtype=value.dtype)
+             for key, value in dataset.items()}
+    for row in idx_batches:
+      for key, value in dataset.items():
+        np.take(value, row, axis=0, out=batch[key], mode='clip')
+      yield batch
 
   @abstractmethod
   def build(self):
@@ -193,6 +260,7 @@ class Model(abc.ABC):
     """
     raise NotImplementedError("")
         
+  @in_model_graph
   def train(self, user_provided_dataset, *additional_usr_datasets,
             num_epochs=100,
             feed_schedule=None,
@@ -285,18 +353,81 @@ class Model(abc.ABC):
                            axis=None):  #pylint: disable=unused-argument
     """
     Run an op
+    
+    If `reduction` is 'sum' or 'mean', the op is run batch by batch and its
+    values are summed into an accumulator variable in the graph. Only the final
+    value is fetched back from the device.
     """
     sess = self.sess
     batch_size = get_dataset_batch_size(feed_dict, self.main_scope)
     if reduction is None:
       self.add_dummy_feeds_to_dataset(feed_dict, batch_size=batch_size)
-      vals = sess.run(opnames, feed_dict=feed_dict)
+      vals = sess.run(opnames, feed_dict=feed_dict, options=self._run_opts)
       self.pop_dummy_feeds_from_dataset(feed_dict)
+    elif reduction in ['sum', 'mean']:
+      vals, nsamps = self.reduce_op_from_batches(opnames, feed_dict)
+      if reduction == 'mean':
+        if isinstance(vals, list):
+          vals = [val/nsamps for val in vals]
+        else:
+          vals = vals/nsamps
     else:
-      raise NotImplementedError("")
+      raise ValueError("`reduction` must be one of None, 'sum' or 'mean'")
     
     return vals
 
+  @in_model_graph
+  def reduce_op_from_batches(self, opnames, feed_dict):
+    """
+    Sum the values of an op, or of a list of ops, over the batches of a
+    feed_dict.
+    
+    Returns the sum (a list of sums if `opnames` is a list) and the number of
+    samples that were run.
+    """
+    sess = self.sess
+    is_list = isinstance(opnames, list)
+    cache_key = tuple(opnames) if is_list else (opnames,)
+    if cache_key not in self._reduce_ops:
+      accs, updates = [], []
+      for opname in cache_key:
+        op = self.graph.get_tensor_by_name(opname)
+        acc = tf.Variable(0.0, dtype=tf.float64, trainable=False,
+                          collections=[tf.GraphKeys.LOCAL_VARIABLES])
+        accs.append(acc)
+        updates.append(tf.assign_add(acc,
+                                     tf.reduce_sum(tf.cast(op, tf.float64))))
+      self._reduce_ops[cache_key] = (accs, tf.group(*updates),
+                                     tf.variables_initializer(accs))
+    accs, update, init = self._reduce_ops[cache_key]
+    
+    nsamps = get_dataset_batch_size(feed_dict, self.main_scope)
+    if nsamps == 0:
+      raise ValueError("Cannot reduce {} over an empty dataset".format(opnames))
+    
+    # Nothing batch dependent changes inside the loop, look it all up once
+    bsz = self.batch_size or 1
+    run_opts = self._run_opts
+    dummy_feeds = {}
+    self.add_dummy_feeds_to_dataset(dummy_feeds, batch_size=bsz)
+    
+    sess.run(init)
+    for batch in batch_iterator_from_dataset(feed_dict, bsz,
+                                             scope=self.main_scope,
+                                             shuffle=False):
+      batch.update(dummy_feeds)
+      sess.run(update, feed_dict=batch, options=run_opts)
+    
+    # The iterator only yields full batches, run the remaining samples too
+    ntail = nsamps % bsz
+    if ntail:
+      tail = {key : value[nsamps-ntail:] for key, value in feed_dict.items()}
+      self.add_dummy_feeds_to_dataset(tail, batch_size=ntail)
+      sess.run(update, feed_dict=tail, options=run_opts)
+    
+    vals = sess.run(accs)
+    return (vals if is_list else vals[0]), nsamps
+
   def add_dummy_feeds_to_dataset(self, dataset, batch_size=None):
     """
     Make a feed_dict for sess.run from a dataset.
@@ -316,6 +447,7 @@ class Model(abc.ABC):
     for key in fd_keys:
       if key.startswith('dummy'): feed_dict.pop(key)
     
+  @in_model_graph
   def restore(self, metafile=None):
     """
     Restore a saved model 
@@ -344,8 +476,7 @@ class Model(abc.ABC):
     """
     Return the latest metafile in the provided directory
     """
-    prefixes = [file[:-5] for file in os.listdir(rslt_dir) if 'meta'==file.split('.')[-1]]
-    return max([f for f in prefixes], key=lambda f : int(f.split('-')[-1])) + '.meta'
+    return get_latest_metafile_in_dir(rslt_dir)
 
   def save_otensor_names(self):
     """
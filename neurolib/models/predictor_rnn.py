@@ -15,7 +15,7 @@
 # ==============================================================================
 import pickle
 
-from neurolib.models.models import Model
+from neurolib.models.models import Model, in_model_graph
 from neurolib.builders.sequential_builder import SequentialBuilder
 from neurolib.trainer.gd_trainer import GDTrainer
 from neurolib.encoder.input import NormalInputNode
@@ -184,6 +184,7 @@ class PredictorRNN(Model):
     this_model_dirs.update(directives)
     super(PredictorRNN, self)._update_default_directives(**this_model_dirs)
             
+  @in_model_graph
   def build(self):
     """
     Builds the PredictorRNN
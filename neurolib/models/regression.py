@@ -15,7 +15,7 @@
 # ==============================================================================
 import pickle
 
-from neurolib.models.models import Model
+from neurolib.models.models import Model, in_model_graph
 
 from neurolib.trainer.gd_trainer import GDTrainer
 from neurolib.builders.static_builder import StaticBuilder
@@ -165,6 +165,7 @@ class Regression(Model):
     this_node_dirs.update(directives)
     super(Regression, self)._update_default_directives(**this_node_dirs)
 
+  @in_model_graph
   def build(self):
     """
     Builds the Regression.
@@ -15,7 +15,7 @@
 # ==============================================================================
 import pickle
 
-from neurolib.models.models import Model
+from neurolib.models.models import Model, in_model_graph
 
 from neurolib.trainer.gd_trainer import GDTrainer
 from neurolib.builders.static_builder import StaticBuilder
@@ -127,6 +127,7 @@ class VariationalAutoEncoder(Model):
                             'tr_lr' : 1e-4})
     super(VariationalAutoEncoder, self)._update_default_directives(**this_model_dirs)
     
+  @in_model_graph
   def build(self):
     """
     Builds the VariationalAutoEncoder.
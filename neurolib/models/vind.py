@@ -18,7 +18,7 @@ import pickle
 import numpy as np
 import tensorflow as tf
 
-from neurolib.models.models import Model
+from neurolib.models.models import Model, in_model_graph
 from neurolib.builders.sequential_builder import SequentialBuilder
 from neurolib.trainer.gd_trainer import VINDTrainer
 from neurolib.encoder.normal import NormalPrecisionNode
@@ -188,6 +188,7 @@ class VIND(Model):
     this_model_dirs.update(directives)
     super(VIND, self)._update_default_directives(**this_model_dirs)
             
+  @in_model_graph
   def build(self):
     """
     Build VIND
@@ -13,12 +13,13 @@
 # limitations under the License.
 #
 # ==============================================================================
-import os
 import pickle
 
 import numpy as np
 import tensorflow as tf
 
+from neurolib.utils.utils import get_latest_metafile_in_dir
+
 # pylint: disable=bad-indentation, no-member, protected-access
 
 class Restore():
@@ -34,20 +35,21 @@ class Restore():
     print('Initiating Restore...')
     self.scope = model
     
-    tf.reset_default_graph()
-    self.sess = tf.Session()
+    self.graph = tf.Graph()
+    self.sess = tf.Session(graph=self.graph)
     
     rslt_dir = rslt_dir if rslt_dir[-1] == '/' else rslt_dir + '/'
     self.rslt_dir = rslt_dir
-    if metafile is None:
-      metafile = self.get_latest_metafile_in_rslt_dir(rslt_dir)
-      print("metafile", metafile)
-      saver = tf.train.import_meta_graph(rslt_dir+metafile)
-    else:
-      saver = tf.train.import_meta_graph(rslt_dir+metafile)
-    print('Restoring Model `{}` from metafile: {}'.format(model, metafile))
-    
-    saver.restore(self.sess, tf.train.latest_checkpoint(rslt_dir))
+    with self.graph.as_default():
+      if metafile is None:
+        metafile = self.get_latest_metafile_in_rslt_dir(rslt_dir)
+        print("metafile", metafile)
+        saver = tf.train.import_meta_graph(rslt_dir+metafile)
+      else:
+        saver = tf.train.import_meta_graph(rslt_dir+metafile)
+      print('Restoring Model `{}` from metafile: {}'.format(model, metafile))
+      
+      saver.restore(self.sess, tf.train.latest_checkpoint(rslt_dir))
     
     self.get_outputs_dict()
       
@@ -56,8 +58,7 @@ class Restore():
     """
     Return the latest metafile in the provided directory
     """
-    prefixes = [file[:-5] for file in os.listdir(rslt_dir) if 'meta'==file.split('.')[-1]]
-    return max([f for f in prefixes], key=lambda f : int(f.split('-')[-1])) + '.meta'
+    return get_latest_metafile_in_dir(rslt_dir)
     
   def get_outputs_dict(self):
     """
@@ -79,12 +80,12 @@ class Restore():
     """
     Split the dataset dictionary into train, validation and test datasets.
     """
+    prefix = self.scope + '/'
     dset = {}
-    for key in dataset:
-      key_split = key.split('_')
-      if key_split[0] == chunk:
-        inode = "_".join(key_split[1:])
-        dset[self.scope + '/' + inode + ':0'] = dataset[key]
+    for key, value in dataset.items():
+      d_set, _, inode = key.partition('_')
+      if d_set == chunk:
+        dset[prefix + inode + ':0'] = value
     
     return dset
     
@@ -18,15 +18,16 @@ path = os.path.dirname(os.path.realpath(__file__))
 import unittest
 import pickle
 
+import numpy as np
 import tensorflow as tf
 
 from neurolib.models.regression import Regression
 
 # pylint: disable=bad-indentation, no-member, protected-access
 
-# NUM_TESTS : 1
+# NUM_TESTS : 2
 range_from = 0
-range_to = 1
+range_to = 2
 tests_to_run = list(range(range_from, range_to))
 
 with open(path + '/datadict_regression', 'rb') as f1:
@@ -55,6 +56,35 @@ class RegressionTestTrain(tf.test.TestCase):
     dc.train(dataset,
              num_epochs=20) # train
     
+  @unittest.skipIf(1 not in tests_to_run, "Skipping")
+  def test_eval_reduction(self):
+    """
+    Test that reduced evals cover the whole dataset
+    """
+    print("Test 1: Regression eval with reduction")
+    
+    # 23 samples do not split evenly into batches of 5
+    rdataset = {'train_Features' : np.random.randn(23, 2),
+                'train_Observation' : np.random.randn(23, 1),
+                'valid_Features' : np.random.randn(7, 2),
+                'valid_Observation' : np.random.randn(7, 1)}
+    dc = Regression(input_dim=2,
+                    output_dim=1,
+                    batch_size=5,
+                    save_on_valid_improvement=False)
+    dc.train(rdataset,
+             num_epochs=1)
+    
+    preds = dc.eval(rdataset, 'Prediction:main', key='train')
+    psum = dc.eval(rdataset, 'Prediction:main', key='train', reduction='sum')
+    pmean = dc.eval(rdataset, 'Prediction:main', key='train', reduction='mean')
+    self.assertAllClose(psum, np.sum(preds))
+    self.assertAllClose(pmean, np.sum(preds)/23)
+    
+    psums = dc.eval(rdataset, ['Prediction:main', 'Prediction:main'],
+                    key='train', reduction='sum')
+    self.assertAllClose(psums, [np.sum(preds)]*2)
+    
     
 if __name__ == '__main__':
   unittest.main(failfast=True)
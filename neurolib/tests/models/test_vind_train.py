@@ -15,9 +15,11 @@
 # ==============================================================================
 import os
 path = os.path.dirname(os.path.realpath(__file__))
+import functools
 import unittest
 import pickle
 
+import numpy as np
 import tensorflow as tf
 
 from neurolib.models.vind import VIND
@@ -29,6 +31,16 @@ range_from = 0
 range_to = 1
 tests_to_run = list(range(range_from, range_to))
 
+@functools.lru_cache(maxsize=1)
+def load_lorenz(fname):
+  """
+  Load the Lorenz datadict once per process, as C-contiguous arrays
+  """
+  with open(fname, 'rb') as f:
+    datadict = pickle.load(f, encoding='latin1')
+  return {key : np.ascontiguousarray(value) for key, value
+          in datadict.items()}
+
 
 class VINDTestTrain(tf.test.TestCase):
   """
@@ -43,9 +55,7 @@ class VINDTestTrain(tf.test.TestCase):
     """
     """
     fname = '/datadict_lorenz'
-    with open(path + fname, 'rb') as f:
-      datadict = pickle.load(f, encoding='latin1')
-
+    datadict = load_lorenz(path + fname)
 
     print("\nTest 1: VIND train")
 
@@ -0,0 +1,109 @@
+# Copyright 2018 Daniel Hernandez Diaz, Columbia University
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ==============================================================================
+import unittest
+import threading
+
+import numpy as np
+
+from neurolib.utils.dataset_manip import (batch_iterator_from_dataset,
+                                          prefetch_batches)
+
+# pylint: disable=bad-indentation, no-member, protected-access
+
+# NUM_TESTS : 4
+range_from = 0
+range_to = 4
+tests_to_run = list(range(range_from, range_to))
+
+
+class PrefetchBatchesTest(unittest.TestCase):
+  """
+  """
+  def setUp(self):
+    """
+    """
+    print()
+
+  @unittest.skipIf(0 not in tests_to_run, "Skipping")
+  def test_order(self):
+    """
+    Test that the batches come out in order
+    """
+    print("Test 0: Prefetched batches order")
+    batches = list(prefetch_batches(iter(range(10)), buffer_size=2))
+    self.assertEqual(batches, list(range(10)))
+
+  @unittest.skipIf(1 not in tests_to_run, "Skipping")
+  def test_close_early(self):
+    """
+    Test that closing the consumer early stops the producer thread
+    """
+    print("Test 1: Prefetched batches close")
+    num_threads = threading.active_count()
+    batch_iter = prefetch_batches(iter(range(100)), buffer_size=2)
+    self.assertEqual(next(batch_iter), 0)
+    self.assertEqual(next(batch_iter), 1)
+    batch_iter.close()
+    self.assertEqual(threading.active_count(), num_threads)
+
+
+class BatchIteratorTest(unittest.TestCase):
+  """
+  """
+  def setUp(self):
+    """
+    """
+    print()
+
+  @unittest.skipIf(2 not in tests_to_run, "Skipping")
+  def test_epoch(self):
+    """
+    Test that an epoch yields disjoint, row aligned batches
+    """
+    print("Test 2: Batch iterator epoch")
+    nsamps, bsz = 23, 5
+    dataset = {'Model/Input_main:0' : np.arange(nsamps*2).reshape(nsamps, 2),
+               'Model/Output_main:0' : 10*np.arange(nsamps).reshape(nsamps, 1)}
+    np.random.seed(0)
+    l_inds = np.arange(nsamps)
+    np.random.shuffle(l_inds)
+    
+    np.random.seed(0)
+    batches = [{key : value.copy() for key, value in batch.items()} for batch
+               in batch_iterator_from_dataset(dataset, bsz, scope='Model',
+                                              num_buffers=2)]
+    self.assertEqual(len(batches), nsamps//bsz)
+    rows = np.concatenate([batch['Model/Input_main:0'][:,0]//2
+                           for batch in batches])
+    self.assertEqual(list(rows), list(l_inds[:(nsamps//bsz)*bsz]))
+    for batch in batches:
+      self.assertEqual(list(batch['Model/Input_main:0'][:,0]//2),
+                       list(batch['Model/Output_main:0'][:,0]//10))
+
+  @unittest.skipIf(3 not in tests_to_run, "Skipping")
+  def test_mismatched_nsamps(self):
+    """
+    Test that arrays with a different number of samples raise a ValueError
+    """
+    print("Test 3: Batch iterator mismatched dataset")
+    dataset = {'Model/Input_main:0' : np.zeros((10, 2)),
+               'Model/Output_main:0' : np.zeros((9, 1))}
+    with self.assertRaises(ValueError):
+      next(batch_iterator_from_dataset(dataset, 3, scope='Model'))
+
+
+if __name__ == '__main__':
+  unittest.main(failfast=True)
@@ -0,0 +1,68 @@
+# Copyright 2018 Daniel Hernandez Diaz, Columbia University
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ==============================================================================
+import os
+import unittest
+import tempfile
+
+from neurolib.utils.utils import get_latest_metafile_in_dir
+
+# pylint: disable=bad-indentation, no-member, protected-access
+
+# NUM_TESTS : 2
+range_from = 0
+range_to = 2
+tests_to_run = list(range(range_from, range_to))
+
+
+class LatestMetafileTest(unittest.TestCase):
+  """
+  """
+  def setUp(self):
+    """
+    """
+    print()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    """
+    """
+    self.tmp_dir.cleanup()
+
+  @unittest.skipIf(0 not in tests_to_run, "Skipping")
+  def test_latest(self):
+    """
+    Test that the step is compared numerically and other files are ignored
+    """
+    print("Test 0: Latest metafile")
+    for fname in ['model-9.meta', 'model-100.meta', 'model-20.meta',
+                  'model-1000.index', 'checkpoint', 'model.meta']:
+      open(os.path.join(self.tmp_dir.name, fname), 'w').close()
+    self.assertEqual(get_latest_metafile_in_dir(self.tmp_dir.name),
+                     'model-100.meta')
+
+  @unittest.skipIf(1 not in tests_to_run, "Skipping")
+  def test_empty(self):
+    """
+    Test that a directory without metafiles raises a ValueError
+    """
+    print("Test 1: No metafile")
+    open(os.path.join(self.tmp_dir.name, 'checkpoint'), 'w').close()
+    with self.assertRaises(ValueError):
+      get_latest_metafile_in_dir(self.tmp_dir.name)
+
+
+if __name__ == '__main__':
+  unittest.main(failfast=True)
@@ -25,7 +25,8 @@ from neurolib.trainer.costs import (mse, mabsdiff, elbo,
                                     cross_entropy_with_logits,
                                     entropy, logprob)
 from neurolib.utils.dataset_manip import (get_dataset_batch_size,
-                                          batch_iterator_from_dataset)
+                                          batch_iterator_from_dataset,
+                                          prefetch_batches)
 
 # pylint: disable=bad-indentation, no-member, protected-access
 
@@ -102,7 +103,8 @@ class GDTrainer(Trainer):
     
     # Saver capabilities after defining train_op
     if self.save:
-      self.saver = tf.train.Saver(tf.global_variables())
+      with self.sess.graph.as_default():
+        self.saver = tf.train.Saver(tf.global_variables())
     self.keep_logs = model.keep_logs
     if self.keep_logs:
       self.writer = tf.summary.FileWriter(addDateTime('./logs/log'))
@@ -158,25 +160,17 @@ class GDTrainer(Trainer):
     """
     Splits the dataset dictionary into train, validation and test datasets.
     """
-    scope = self.scope
-    train_dataset = {}
-    valid_dataset = {}
-    test_dataset = {}
-    for key in dataset:
-      d_set, inode = key.split('_')[0], key.split('_')[-1]
-      if d_set == 'train':
-        train_dataset[scope + '/' + inode + ':0'] = dataset[key]
-      elif d_set == 'valid':
-        valid_dataset[scope + '/' + inode + ':0'] = dataset[key]
-      elif d_set == 'test':
-        test_dataset[scope + '/' + inode + ':0'] = dataset[key]
-      else:
+    prefix = self.scope + '/'
+    buckets = {'train' : {}, 'valid' : {}, 'test' : {}}
+    for key, value in dataset.items():
+      d_set, _, inode = key.partition('_')
+      bucket = buckets.get(d_set)
+      if bucket is None:
         raise KeyError("The dataset contains the key `{}`. The only allowed "
                        "prefixes for keys in the dataset are 'train', "
                        "'valid' and 'test'".format(key))
-    return {'train' : train_dataset,
-            'valid' : valid_dataset, 
-            'test' : test_dataset}
+      bucket[prefix + inode + ':0'] = value
+    return buckets
     
   def train(self, dataset_dict, num_epochs, batch_size=None):
     """
@@ -237,12 +231,17 @@ class GDTrainer(Trainer):
     """
     Perform a single gradient descent update for the variables in this cost.
     
+    Batches are gathered in a background thread while the previous one is
+    being run.
+    
     TODO: Document!
-    TODO: Get rid of the feed_dict in favor of tensorflow Queues! Add
-    multithreading capabilities
+    TODO: Get rid of the feed_dict in favor of tensorflow Queues!
     """
-    dataset_iter = batch_iterator_from_dataset(dataset, batch_size,
-                                               scope=self.scope)
+    buffer_size = 2
+    dataset_iter = prefetch_batches(
+        batch_iterator_from_dataset(dataset, batch_size, scope=self.scope,
+                                    num_buffers=buffer_size+2),
+        buffer_size=buffer_size)
     
     for feed_dict in dataset_iter:
       if lr is not None:
@@ -13,6 +13,10 @@
 # limitations under the License.
 #
 # ==============================================================================
+import functools
+import queue
+import threading
+
 import numpy as np
 
 # pylint: disable=bad-indentation, no-member
@@ -22,11 +26,9 @@ def prepare_restore_user_dataset_for_eval(f):
   Method decorator to use in every method of a Model subclass that takes a user-
   provided dataset as an input
   """
-  is_tr_vd_dset = lambda dset : (('train' in 
-                                  [key.split('_')[0] for key in dset.keys()])
-                                  and 
-                                  ('valid' in 
-                                   [key.split('_')[0] for key in dset.keys()]))
+  def is_tr_vd_dset(dset):
+    d_sets = {key.partition('_')[0] for key in dset}
+    return 'train' in d_sets and 'valid' in d_sets
   def wrapped_eval(self, usr_dataset, *args, **kwargs):
     """
     Runs an eval-type function from a user-provided dataset.
@@ -68,15 +70,14 @@ def make_train_valid_test_feeddicts(user_provided_dset, scope=None):
     the InputNodes that will be fed with it.
   """
   user_keys = list(user_provided_dset.keys())
-  user_provided_dset['train'] = {}
-  user_provided_dset['valid'] = {}
+  buckets = {'train' : {}, 'valid' : {}}
+  user_provided_dset.update(buckets)
   for key in user_keys:
-    d_set, inode = key.split('_')[0], "_".join(key.split('_')[1:])
-    feed_key = make_input_node_feed_key(inode, scope)
-    if d_set == 'train':
-      user_provided_dset['train'][feed_key] = user_provided_dset.pop(key)
-    elif d_set == 'valid':
-      user_provided_dset['valid'][feed_key] = user_provided_dset.pop(key)
+    d_set, _, inode = key.partition('_')
+    bucket = buckets.get(d_set)
+    if bucket is not None:
+      feed_key = make_input_node_feed_key(inode, scope)
+      bucket[feed_key] = make_contiguous(user_provided_dset.pop(key))
 
   return user_provided_dset
   
@@ -92,9 +93,20 @@ def make_feeddict(user_provided_dset):
   """
   for key in user_provided_dset:
     feed_key = make_input_node_feed_key(key)
-    user_provided_dset[feed_key] = user_provided_dset.pop(key)
+    user_provided_dset[feed_key] = make_contiguous(user_provided_dset.pop(key))
   return user_provided_dset
 
+def make_contiguous(value):
+  """
+  Return a C-contiguous version of an array, copying it only if necessary.
+  
+  tensorflow repacks non-contiguous feeds on every call to `sess.run`, so the
+  data is made contiguous once, when it enters the feeddict.
+  """
+  if isinstance(value, np.ndarray):
+    return np.ascontiguousarray(value)
+  return value
+
 def restore_dataset(feed_dict, is_train_valid=False):
   """
   Restore a user-provided dataset from a feeddict used by the neurolib's methods
@@ -113,9 +125,13 @@ def restore_dataset(feed_dict, is_train_valid=False):
       del feed_dict[subdset]
   return feed_dict
       
+@functools.lru_cache(maxsize=None)
 def make_input_node_feed_key(oname, scope=None):
   """
   Turn a Input Node name to a tensorflow feeddict key inside a given scope
+  
+  The feed keys are memoized since the same few InputNode names are converted
+  on every call to a Model's eval/train methods.
   """
   return oname + '_main:0' if scope is None else scope + '/' + oname + '_main:0'
 
@@ -141,17 +157,88 @@ def get_dataset_batch_size(dataset, scope=''):
   obskey = next(key for key in dataset if key.startswith(scope))
   return dataset[obskey].shape[0]
 
+def check_dataset_nsamps(dataset, nsamps):
+  """
+  Check that every array in a dataset has `nsamps` samples along axis 0
+  """
+  for key, value in dataset.items():
+    if value.shape[0] != nsamps:
+      raise ValueError("The dataset entry {} has {} samples, expected {}"
+                       "".format(key, value.shape[0], nsamps))
+
 def batch_iterator_from_dataset(dataset, batch_size, scope='',
-                                shuffle=True):
+                                shuffle=True,
+                                num_buffers=1):
   """
   Make a batch iterator from a dataset
+  
+  The batches are gathered into `num_buffers` preallocated batch dicts that are
+  reused cyclically. A batch must hence be consumed before `num_buffers`
+  further batches are requested from the iterator.
   """
   nsamps = get_dataset_batch_size(dataset, scope=scope)
+  check_dataset_nsamps(dataset, nsamps)
   l_inds = np.arange(nsamps)
   if shuffle:
     np.random.shuffle(l_inds)
-  for idx in range(nsamps//batch_size):
-    batch = {key : value[l_inds[idx:idx+batch_size]] for key, value
-             in dataset.items()}
+  idx_batches = l_inds[:(nsamps//batch_size)*batch_size].reshape(-1, batch_size)
+  # The indices are in range after the check above, so mode='clip' is safe
+  buffers = [{key : np.empty((batch_size,) + value.shape[1:], dtype=value.dtype)
+              for key, value in dataset.items()} for _ in range(num_buffers)]
+  for i, row in enumerate(idx_batches):
+    batch = buffers[i % num_buffers]
+    for key, value in dataset.items():
+      np.take(value, row, axis=0, out=batch[key], mode='clip')
     yield batch
-  
\ No newline at end of file
+
+def prefetch_batches(batch_iter, buffer_size=2):
+  """
+  Wrap a batch iterator so that batches are gathered in a background thread.
+  
+  While the consumer runs a batch through the tf.Session, the next
+  `buffer_size` batches are assembled, overlapping the host-side gather with
+  the graph computation. If `batch_iter` reuses its batch buffers, it must
+  cycle through at least `buffer_size + 2` of them.
+  
+  The background thread is stopped and joined when the returned generator is
+  exhausted, closed or garbage collected.
+  """
+  sentinel = object()
+  stop = threading.Event()
+  batch_queue = queue.Queue(maxsize=buffer_size)
+  
+  def put(item):
+    """
+    Put an item in the queue. Return False if the consumer stopped first.
+    """
+    while not stop.is_set():
+      try:
+        batch_queue.put(item, timeout=0.1)
+        return True
+      except queue.Full:
+        pass
+    return False
+  
+  def produce():
+    try:
+      for batch in batch_iter:
+        if not put(batch):
+          return
+    except Exception as e:  #pylint: disable=broad-except
+      put(e)
+    finally:
+      put(sentinel)
+  
+  producer = threading.Thread(target=produce, daemon=True)
+  producer.start()
+  try:
+    while True:
+      batch = batch_queue.get()
+      if batch is sentinel:
+        break
+      if isinstance(batch, Exception):
+        raise batch
+      yield batch
+  finally:
+    stop.set()
+    producer.join()
@@ -14,6 +14,7 @@
 #
 # ==============================================================================
 import datetime
+import os
 
 import numpy as np
 import tensorflow as tf
@@ -90,6 +91,36 @@ def addDateTime(s = ""):
   date = date[2:4] + date[5:7] + date[8:10] + '_' + date[11:13] + date[14:16]
   return s + 'D' + date
 
+def xla_enabled():
+  """
+  Return True if XLA JIT compilation was requested by setting the environment
+  variable NEUROLIB_XLA to '1'
+  """
+  return os.environ.get('NEUROLIB_XLA') == '1'
+
+def get_latest_metafile_in_dir(rslt_dir):
+  """
+  Return the name of the metafile with the highest global step in a directory
+  
+  Metafiles are expected to have the form 'prefix-step.meta'.
+  """
+  best_step, best_name = -1, None
+  # os.scandir iterators are not context managers before python 3.6. Iterating
+  # through to the end closes them.
+  for entry in os.scandir(rslt_dir):
+    name = entry.name
+    if not name.endswith('.meta'):
+      continue
+    try:
+      step = int(name[:-5].rpartition('-')[2])
+    except ValueError:
+      continue
+    if step > best_step:
+      best_step, best_name = step, name
+  if best_name is None:
+    raise ValueError("No metafile found in directory {}".format(rslt_dir))
+  return best_name
+
 def format_dirname(dirname):
   """
   """